@@ -8,11 +8,14 @@ This module handles:
 """
 
 import streamlit as st
+import time
+import pandas as pd
 from typing import Dict, Optional, List
 import persistence
 
 
-def render_annotation_form(record: Dict, user_id: str, username: str) -> Optional[Dict]:
+def render_annotation_form(record: Dict, user_id: str, username: str,
+                           existing_annotation: Optional[Dict] = None) -> Optional[Dict]:
     """
     Render the annotation form for a single record.
     
@@ -24,6 +27,8 @@ def render_annotation_form(record: Dict, user_id: str, username: str) -> Optiona
         record: Dictionary containing record data
         user_id: Current user ID
         username: Current username
+        existing_annotation: The record's annotation from the caller's already-loaded
+            annotations, or None if it has none
         
     Returns:
         Dictionary with annotation data if submitted, None otherwise
@@ -37,12 +42,25 @@ def render_annotation_form(record: Dict, user_id: str, username: str) -> Optiona
     
     # Check if this is the new conversations format
     if "conversations" in record:
-        return render_conversations_form(record, record_id, user_id, username)
+        return render_conversations_form(record, record_id, user_id, username, existing_annotation)
     else:
-        return render_old_format_form(record, record_id, user_id, username)
+        return render_old_format_form(record, record_id, user_id, username, existing_annotation)
 
 
-def render_conversations_form(record: Dict, record_id: str, user_id: str, username: str) -> Optional[Dict]:
+def _initial_display(existing_annotation: Optional[Dict], user_id: str, edited_key: str, fallback):
+    """
+    Resolve the content to show in the editor for a record.
+    
+    Returns the user's earlier edit (stored under edited_key) if they annotated
+    this record before, otherwise the original content passed as fallback.
+    """
+    if existing_annotation and existing_annotation.get("user_id") == user_id:
+        return existing_annotation.get(edited_key) or fallback
+    return fallback
+
+
+def render_conversations_form(record: Dict, record_id: str, user_id: str, username: str,
+                              existing_annotation: Optional[Dict] = None) -> Optional[Dict]:
     """
     Render annotation form for conversations format.
     
@@ -51,6 +69,7 @@ def render_conversations_form(record: Dict, record_id: str, user_id: str, userna
         record_id: Record ID
         user_id: Current user ID
         username: Current username
+        existing_annotation: Existing annotation for this record, if any
         
     Returns:
         Annotation data dict if submitted, None otherwise
@@ -60,102 +79,87 @@ def render_conversations_form(record: Dict, record_id: str, user_id: str, userna
     st.markdown("### Conversation Messages")
     
     # Check if there's an existing annotation
-    existing_annotation = persistence.get_annotation(record_id)
     if existing_annotation and existing_annotation.get("user_id") == user_id:
         st.success(f"✓ Previously annotated by you at {existing_annotation.get('timestamp', 'unknown time')}")
-        if existing_annotation.get("edited_conversations"):
-            display_conversations = existing_annotation["edited_conversations"]
-        else:
-            display_conversations = conversations
-    else:
-        display_conversations = conversations
-    
-    # Store original conversations for comparison
-    original_conversations_json = str(conversations)
+    display_conversations = _initial_display(existing_annotation, user_id, "edited_conversations", conversations)
     
-    # Display and allow editing of each conversation message
-    edited_conversations = []
+    # Store original message contents once per record for edit detection
+    original_key = f"orig_{record_id}"
+    if original_key not in st.session_state:
+        st.session_state[original_key] = tuple(
+            conv.get("content", "").strip() for conv in conversations
+        )
     
-    for idx, conv in enumerate(display_conversations):
-        role = conv.get("role", "")
-        content = conv.get("content", "")
+    # Display and allow editing of all messages in a single data editor widget
+    # inside an st.form, so keystrokes don't rerun anything until submit.
+    with st.form(f"ann_{record_id}"):
+        edited_df = st.data_editor(
+            pd.DataFrame(display_conversations, columns=["role", "content"]),
+            disabled=["role"],
+            column_config={
+                "role": st.column_config.TextColumn("Role", width="small"),
+                "content": st.column_config.TextColumn("Message", width="large"),
+            },
+            hide_index=True,
+            use_container_width=True,
+            key=f"conv_editor_{record_id}"
+        )
         
-        # Role badge
-        if role == "user":
-            st.markdown(f"#### 👤 User Message {idx + 1}")
-            role_color = "🔵"
-        else:
-            st.markdown(f"#### 🤖 Assistant Message {idx + 1}")
-            role_color = "🟢"
+        st.divider()
         
-        # Editable text area for each message
-        edited_content = st.text_area(
-            f"Edit {role} message:",
-            value=content,
-            height=100,
-            key=f"conv_{record_id}_{idx}",
-            label_visibility="collapsed"
+        # Correctness question
+        st.markdown("### Is this conversation correct?")
+        
+        # Radio button for correctness
+        is_correct = st.radio(
+            "Select your answer:",
+            ["Yes", "No"],
+            key=f"correctness_{record_id}",
+            horizontal=True
         )
         
-        edited_conversations.append({
-            "role": role,
-            "content": edited_content.strip()
-        })
+        st.divider()
         
-        # Add divider between messages (but not after the last one)
-        if idx < len(display_conversations) - 1:
-            st.divider()
-    
-    st.divider()
-    
-    # Correctness question
-    st.markdown("### Is this conversation correct?")
+        # Submit button
+        col1, col2, col3 = st.columns([1, 1, 1])
+        
+        with col2:
+            submitted = st.form_submit_button("💾 Save Annotation", type="primary", use_container_width=True)
     
-    # Radio button for correctness
-    is_correct = st.radio(
-        "Select your answer:",
-        ["Yes", "No"],
-        key=f"correctness_{record_id}",
-        horizontal=True
-    )
+    if not submitted:
+        return None
     
     is_correct_bool = (is_correct == "Yes")
+    edited_contents = tuple(edited_df["content"].fillna("").str.strip())
     
     # Validation: If "No", require that at least one message was edited
-    if not is_correct_bool:
-        # Compare edited conversations with original
-        edited_conversations_json = str(edited_conversations)
-        if edited_conversations_json == original_conversations_json:
-            st.warning("⚠️ Please edit at least one message since you marked the conversation as incorrect.")
-            st.stop()
-    
-    st.divider()
-    
-    # Submit button
-    col1, col2, col3 = st.columns([1, 1, 1])
-    
-    with col2:
-        if st.button("💾 Save Annotation", type="primary", key=f"submit_{record_id}", use_container_width=True):
-            # Validate input - ensure all messages have content
-            all_valid = True
-            for idx, conv in enumerate(edited_conversations):
-                if not conv["content"].strip():
-                    st.error(f"Message {idx + 1} ({conv['role']}) cannot be empty!")
-                    all_valid = False
-            
-            if not all_valid:
-                st.stop()
-            
-            # Return annotation data
-            return {
-                "is_correct": is_correct_bool,
-                "edited_conversations": edited_conversations if not is_correct_bool else None
-            }
-    
-    return None
+    if not is_correct_bool and edited_contents == st.session_state[original_key]:
+        st.warning("⚠️ Please edit at least one message since you marked the conversation as incorrect.")
+        st.stop()
+    
+    # Strip once on submit, then ensure all messages have content
+    cleaned_conversations = [
+        {"role": role, "content": content}
+        for role, content in zip(edited_df["role"], edited_contents)
+    ]
+    all_valid = True
+    for idx, conv in enumerate(cleaned_conversations):
+        if not conv["content"]:
+            st.error(f"Message {idx + 1} ({conv['role']}) cannot be empty!")
+            all_valid = False
+    
+    if not all_valid:
+        st.stop()
+    
+    # Return annotation data
+    return {
+        "is_correct": is_correct_bool,
+        "edited_conversations": cleaned_conversations if not is_correct_bool else None
+    }
 
 
-def render_old_format_form(record: Dict, record_id: str, user_id: str, username: str) -> Optional[Dict]:
+def render_old_format_form(record: Dict, record_id: str, user_id: str, username: str,
+                           existing_annotation: Optional[Dict] = None) -> Optional[Dict]:
     """
     Render annotation form for old format (source_text, pidgin_translation).
     
@@ -164,6 +168,7 @@ def render_old_format_form(record: Dict, record_id: str, user_id: str, username:
         record_id: Record ID
         user_id: Current user ID
         username: Current username
+        existing_annotation: Existing annotation for this record, if any
         
     Returns:
         Annotation data dict if submitted, None otherwise
@@ -181,84 +186,95 @@ def render_old_format_form(record: Dict, record_id: str, user_id: str, username:
     st.subheader("Current Pidgin Translation")
     
     # Check if there's an existing annotation
-    existing_annotation = persistence.get_annotation(record_id)
     if existing_annotation and existing_annotation.get("user_id") == user_id:
         # Show existing annotation
         st.success(f"✓ Previously annotated by you at {existing_annotation.get('timestamp', 'unknown time')}")
-        if existing_annotation.get("edited_translation"):
-            display_translation = existing_annotation["edited_translation"]
-        else:
-            display_translation = current_translation
-    else:
-        display_translation = current_translation
-    
-    # Editable text area for translation
-    edited_translation = st.text_area(
-        "Edit translation if needed:",
-        value=display_translation,
-        height=150,
-        key=f"translation_{record_id}",
-        label_visibility="collapsed"
-    )
-    
-    st.divider()
-    
-    # Correctness question
-    st.subheader("Is this translation correct?")
+    display_translation = _initial_display(existing_annotation, user_id, "edited_translation", current_translation)
+    
+    # Editable text area and correctness question inside an st.form so
+    # keystrokes don't rerun anything until the form is submitted
+    with st.form(f"ann_{record_id}"):
+        edited_translation = st.text_area(
+            "Edit",
+            value=display_translation,
+            height=150,
+            key=f"translation_{record_id}",
+            label_visibility="collapsed"
+        )
+        
+        st.divider()
+        
+        # Correctness question
+        st.subheader("Is this translation correct?")
+        
+        # Radio button for correctness
+        is_correct = st.radio(
+            "Select your answer:",
+            ["Yes", "No"],
+            key=f"correctness_{record_id}",
+            horizontal=True
+        )
+        
+        st.divider()
+        
+        # Submit button
+        col1, col2, col3 = st.columns([1, 1, 1])
+        
+        with col2:
+            submitted = st.form_submit_button("💾 Save Annotation", type="primary", use_container_width=True)
     
-    # Radio button for correctness
-    is_correct = st.radio(
-        "Select your answer:",
-        ["Yes", "No"],
-        key=f"correctness_{record_id}",
-        horizontal=True
-    )
+    if not submitted:
+        return None
     
     is_correct_bool = (is_correct == "Yes")
+    cleaned_translation = edited_translation.strip()
     
     # Validation: If "No", require that translation was edited
-    if not is_correct_bool:
-        if edited_translation.strip() == current_translation.strip():
-            st.warning("⚠️ Please edit the translation since you marked it as incorrect.")
-            st.stop()
-    
-    st.divider()
-    
-    # Submit button
-    col1, col2, col3 = st.columns([1, 1, 1])
-    
-    with col2:
-        if st.button("💾 Save Annotation", type="primary", key=f"submit_{record_id}", use_container_width=True):
-            # Validate input
-            if not edited_translation.strip():
-                st.error("Translation cannot be empty!")
-                st.stop()
-            
-            # Return annotation data
-            return {
-                "is_correct": is_correct_bool,
-                "edited_translation": edited_translation.strip() if not is_correct_bool else None
-            }
-    
-    return None
+    if not is_correct_bool and cleaned_translation == current_translation.strip():
+        st.warning("⚠️ Please edit the translation since you marked it as incorrect.")
+        st.stop()
+    
+    # Validate input
+    if not cleaned_translation:
+        st.error("Translation cannot be empty!")
+        st.stop()
+    
+    # Return annotation data
+    return {
+        "is_correct": is_correct_bool,
+        "edited_translation": cleaned_translation if not is_correct_bool else None
+    }
 
 
-def render_progress_bar(completed: int, total: int) -> None:
+def render_progress_bar(completed: int, total: int, slot=None):
     """
     Render a progress bar showing annotation progress.
     
+    The bar is drawn into a single st.empty() placeholder, so callers can update
+    it in place later in the same run instead of adding new elements.
+    
     Args:
         completed: Number of completed items
         total: Total number of items
+        slot: Placeholder returned by an earlier call to update, or None for a new one
+        
+    Returns:
+        The placeholder the bar was drawn into
     """
-    if total == 0:
-        st.progress(0.0)
-        st.caption("No items to annotate")
-        return
-    
-    progress = completed / total
-    st.progress(progress)
-    st.caption(f"{completed} of {total} completed ({progress * 100:.1f}%)")
+    if slot is None:
+        slot = st.empty()
+    
+    with slot.container():
+        if total == 0:
+            st.progress(0.0)
+            st.caption("No items to annotate")
+            return slot
+        
+        progress = completed / total
+        st.progress(progress)
+        st.caption(f"{completed} of {total} completed ({progress * 100:.1f}%)")
+    
+    return slot
 
 
 def get_next_record_to_annotate(records: list[Dict], user_id: str) -> Optional[Dict]:
@@ -269,30 +285,21 @@ def get_next_record_to_annotate(records: list[Dict], user_id: str) -> Optional[D
     - Has not been annotated by this user
     - Is not currently assigned to another user
     """
-    annotations = persistence.load_annotations()
-    assignments = persistence.load_assignments()
-    
-    import time
-    current_time = time.time()
+    # Both indexes come from persistence's per-version caches, so this only
+    # scans the records up to the first available one
+    annotated_by_user = persistence.load_annotations_index().get(user_id, set())
+    live_locks = persistence.index_live_locks(persistence.load_assignments(), time.time())
     
     for record in records:
         record_id = record.get("id")
         
         # Skip if already annotated by this user
-        if record_id in annotations:
-            if annotations[record_id].get("user_id") == user_id:
-                continue
+        if record_id in annotated_by_user:
+            continue
         
-        # Check if assigned to another user
-        if record_id in assignments:
-            assignment = assignments[record_id]
-            assignment_time = assignment.get("timestamp", 0)
-            assigned_user = assignment.get("user_id")
-            
-            # Skip if assigned to another user and not expired
-            if (assigned_user != user_id and 
-                current_time - assignment_time < persistence.LOCK_TIMEOUT):
-                continue
+        # Skip if assigned to another user and not expired
+        if record_id in live_locks and live_locks[record_id] != user_id:
+            continue
         
         # This record is available
         return record
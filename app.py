@@ -10,7 +10,9 @@ This application provides:
 
 import streamlit as st
 import os
-from typing import Optional
+import time
+import pandas as pd
+from typing import Dict, List, Optional
 
 # Import our modules
 import auth
@@ -29,15 +31,84 @@ st.set_page_config(
 )
 
 
-# Initialize default users on startup
-if "users_initialized" not in st.session_state:
+# Initialize default users once per server process (shared across sessions)
+@st.cache_resource(show_spinner=False)
+def _init_users_once() -> bool:
     auth.initialize_default_users()
-    st.session_state["users_initialized"] = True
+    return True
+
+
+_init_users_once()
 
 
 # Default data file path
 DEFAULT_DATA_FILE = "data.jsonl"
 
+# Annotation fields used to build the admin audit trail
+AUDIT_TRAIL_FIELDS = ["username", "is_correct", "edited_translation", "edited_conversations", "timestamp"]
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_records(path: str, mtime_ns: int, size: int):
+    """
+    Validate and load a JSONL file, cached per (path, mtime, size).
+    
+    Held with cache_resource so every session shares one parsed copy instead of
+    unpickling its own on each call; callers must treat the records as read-only.
+    Only a few file versions are kept so replaced data files don't pile up in memory.
+    """
+    is_valid, error_msg, records = data_loader.validate_jsonl_file(path)
+    records_by_id = {record.get("id"): record for record in records}
+    all_record_ids = [record.get("id") for record in records]
+    return is_valid, error_msg, records, records_by_id, all_record_ids
+
+
+def load_records(path: str):
+    """
+    Load and validate the data file, re-reading it only when it changes on disk.
+    
+    Returns:
+        (is_valid: bool, error_message: Optional[str], records: List[Dict],
+         records_by_id: Dict[str, Dict], all_record_ids: List[str])
+    """
+    stat = os.stat(path)
+    return _load_records(path, stat.st_mtime_ns, stat.st_size)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def _audit_trail_frame(_annotations: Dict, version: tuple) -> pd.DataFrame:
+    """
+    Build the admin audit-trail table with column-wise operations.
+    
+    Cached per (mtime, size) of the annotations snapshot and journal;
+    _annotations is excluded from the cache key since the version already
+    identifies its contents (every save grows the journal or rewrites the
+    snapshot). Only the latest table is kept, as every save makes the previous
+    one stale.
+    """
+    df = pd.DataFrame.from_dict(_annotations, orient="index").reindex(columns=AUDIT_TRAIL_FIELDS)
+    
+    # Check if conversations or translation was edited
+    was_edited = df["edited_translation"].notna() | df["edited_conversations"].notna()
+    
+    return pd.DataFrame({
+        "Record ID": df.index,
+        "Annotator": df["username"].fillna("Unknown"),
+        "Correct": df["is_correct"].eq(True).map({True: "✓", False: "✗"}),
+        "Edited": was_edited.map({True: "Yes", False: "No"}),
+        "Timestamp": df["timestamp"].fillna("Unknown")
+    })
+
+
+def _render_task_complete(annotation_count: int):
+    """Render the completion screen shown once a tester has finished their task."""
+    st.balloons()
+    st.success("🎉 Congratulations! You've completed your annotation task!")
+    st.markdown("### Task Completed!")
+    st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
+    st.markdown("---")
+    st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+
 
 def login_page():
     """Render the login page."""
@@ -92,19 +163,13 @@ def tester_view():
         st.info("Please contact the administrator to set up the annotation data file.")
         return
     
-    # Load and validate data
-    if "records" not in st.session_state or st.session_state.get("data_file") != data_file:
-        with st.spinner("Loading data..."):
-            is_valid, error_msg, records = data_loader.validate_jsonl_file(data_file)
-            
-            if not is_valid:
-                st.error(f"Error loading data: {error_msg}")
-                return
-            
-            st.session_state["records"] = records
-            st.session_state["data_file"] = data_file
+    # Load and validate data (cached per file version)
+    with st.spinner("Loading data..."):
+        is_valid, error_msg, records, records_by_id, all_record_ids = load_records(data_file)
     
-    records = st.session_state.get("records", [])
+    if not is_valid:
+        st.error(f"Error loading data: {error_msg}")
+        return
     
     if not records:
         st.warning("No records to annotate.")
@@ -113,52 +178,36 @@ def tester_view():
     # Batch assignment logic with hard limit enforcement
     batch_size = config.get_batch_size()
     
+    # Count, limit and batch status from a single read of the annotations
+    state = persistence.get_user_state(user_id, batch_size)
+    
     # HARD LIMIT CHECK: Server-side validation before serving any records
-    if not persistence.can_user_annotate(user_id, batch_size):
+    if not state["can_annotate"]:
         # User has reached their limit - show completion screen
-        annotation_count = persistence.get_user_annotation_count(user_id)
-        st.balloons()
-        st.success("🎉 Congratulations! You've completed your annotation task!")
-        st.markdown("### Task Completed!")
-        st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
-        st.markdown("---")
-        st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+        _render_task_complete(state["count"])
         return
     
-    user_batch = persistence.get_user_batch(user_id)
+    user_batch = state["batch"]
     
     # Check if user needs a new batch (only if they haven't reached limit)
-    if persistence.user_has_completed_batch(user_id):
+    if state["batch_complete"]:
         # Double-check limit before assigning (server-side enforcement)
-        if persistence.user_has_reached_limit(user_id, batch_size):
+        if state["reached_limit"]:
             # User has reached limit - show completion screen
-            annotation_count = persistence.get_user_annotation_count(user_id)
-            st.balloons()
-            st.success("🎉 Congratulations! You've completed your annotation task!")
-            st.markdown("### Task Completed!")
-            st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
-            st.markdown("---")
-            st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+            _render_task_complete(state["count"])
             return
         
         # Assign new batch (only if under limit)
-        all_record_ids = [r.get("id") for r in records]
         new_batch = persistence.assign_batch_to_user(user_id, batch_size, all_record_ids)
         if new_batch:
+            # Render the new batch in this run instead of rerunning the script
             user_batch = new_batch
             st.info(f"📦 You've been assigned {len(new_batch)} records to annotate!")
-            st.rerun()
         else:
             # No batch assigned (likely reached limit or no records available)
-            annotation_count = persistence.get_user_annotation_count(user_id)
-            if annotation_count >= batch_size:
+            if state["reached_limit"]:
                 # Reached limit
-                st.balloons()
-                st.success("🎉 Congratulations! You've completed your annotation task!")
-                st.markdown("### Task Completed!")
-                st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
-                st.markdown("---")
-                st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+                _render_task_complete(state["count"])
             else:
                 # No records available
                 st.info("📦 No more records available for assignment.")
@@ -167,46 +216,56 @@ def tester_view():
     # Ensure user has a batch assigned
     if not user_batch:
         # Check limit before assigning
-        if persistence.user_has_reached_limit(user_id, batch_size):
-            annotation_count = persistence.get_user_annotation_count(user_id)
-            st.balloons()
-            st.success("🎉 Congratulations! You've completed your annotation task!")
-            st.markdown("### Task Completed!")
-            st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
+        if state["reached_limit"]:
+            _render_task_complete(state["count"])
             return
         
         # Try to assign initial batch
-        all_record_ids = [r.get("id") for r in records]
         new_batch = persistence.assign_batch_to_user(user_id, batch_size, all_record_ids)
         if new_batch:
+            # Render the new batch in this run instead of rerunning the script
             user_batch = new_batch
             st.info(f"📦 You've been assigned {len(new_batch)} records to annotate!")
-            st.rerun()
         else:
             st.info("📦 Waiting for batch assignment...")
+            # Back off briefly so waiting sessions don't rerun in a tight loop
+            time.sleep(0.5)
             st.rerun()
-        return
     
+    # Position of each record in the batch, rebuilt only when the batch changes
+    if st.session_state.get("batch_pos_ids") != user_batch:
+        st.session_state["batch_pos_ids"] = user_batch
+        st.session_state["batch_pos"] = {rid: idx for idx, rid in enumerate(user_batch)}
+    
+    _annotate_fragment(user_id, username, user_batch, st.session_state["batch_pos"],
+                       records_by_id, batch_size)
+
+
+@st.fragment
+def _annotate_fragment(user_id: str, username: str, user_batch: List[str],
+                       batch_pos: Dict[str, int], records_by_id: Dict[str, Dict],
+                       batch_size: int):
+    """
+    Render batch progress and the annotation form for the current record.
+    
+    Runs as a fragment so saving or skipping a record only reruns this part of
+    the page, not authentication, data loading and the sidebar. batch_pos maps
+    each record ID in user_batch to its position, for O(1) lookups.
+    """
     # Show batch progress only (no overall progress)
-    annotations = persistence.load_annotations()
-    batch_completed = sum(1 for rid in user_batch 
-                         if rid in annotations and annotations[rid].get("user_id") == user_id)
+    state = persistence.get_user_state(user_id, batch_size)
+    user_done = persistence.load_annotations_index().get(user_id, set())
+    batch_completed = sum(1 for rid in user_batch if rid in user_done)
     batch_total = len(user_batch)
     
     st.markdown(f"### Your Batch Progress ({batch_completed}/{batch_total})")
-    annotation_ui.render_progress_bar(batch_completed, batch_total)
+    progress_slot = annotation_ui.render_progress_bar(batch_completed, batch_total)
     
     st.divider()
     
     # HARD LIMIT CHECK: Validate before serving any record
-    if not persistence.can_user_annotate(user_id, batch_size):
-        annotation_count = persistence.get_user_annotation_count(user_id)
-        st.balloons()
-        st.success("🎉 Congratulations! You've completed your annotation task!")
-        st.markdown("### Task Completed!")
-        st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
-        st.markdown("---")
-        st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+    if not state["can_annotate"]:
+        _render_task_complete(state["count"])
         return
     
     # Get current record to annotate from user's batch
@@ -214,53 +273,28 @@ def tester_view():
     current_record = None
     
     # Find next unannotated record in user's batch
-    if not current_record_id or current_record_id not in user_batch:
-        annotations = persistence.load_annotations()
-        for record_id in user_batch:
-            # Check if this record is already annotated by this user
-            if record_id in annotations and annotations[record_id].get("user_id") == user_id:
-                continue
+    if not current_record_id or current_record_id not in batch_pos:
+        next_record_id = next((rid for rid in user_batch if rid not in user_done), None)
+        if next_record_id:
             # Found an unannotated record in batch
-            current_record_id = record_id
+            current_record_id = next_record_id
             st.session_state["current_record_id"] = current_record_id
-            break
-    else:
-        # Current record is in batch, verify it exists
-        current_record = next(
-            (r for r in records if r.get("id") == current_record_id),
-            None
-        )
     
     # Find the record object
     if current_record_id:
-        current_record = next(
-            (r for r in records if r.get("id") == current_record_id),
-            None
-        )
+        current_record = records_by_id.get(current_record_id)
     
     if not current_record:
         # All records in batch are completed - check limit first
-        if persistence.user_has_reached_limit(user_id, batch_size):
+        if state["reached_limit"]:
             # User has reached limit - show completion screen
-            annotation_count = persistence.get_user_annotation_count(user_id)
-            st.balloons()
-            st.success("🎉 Congratulations! You've completed your annotation task!")
-            st.markdown("### Task Completed!")
-            st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
-            st.markdown("---")
-            st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+            _render_task_complete(state["count"])
             return
         
         # Batch completed but under limit - this shouldn't happen with single batch limit
         # But handle gracefully by showing completion
-        if persistence.user_has_completed_batch(user_id):
-            annotation_count = persistence.get_user_annotation_count(user_id)
-            st.balloons()
-            st.success("🎉 Congratulations! You've completed your annotation task!")
-            st.markdown("### Task Completed!")
-            st.info(f"You have successfully completed {annotation_count} annotations. Thank you for your work!")
-            st.markdown("---")
-            st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+        if state["batch_complete"]:
+            _render_task_complete(state["count"])
             return
         else:
             # This shouldn't happen, but handle gracefully
@@ -269,12 +303,13 @@ def tester_view():
             return
     
     # Display record number in batch only (no overall count)
-    record_index_in_batch = user_batch.index(current_record_id) + 1 if current_record_id in user_batch else 0
+    record_index_in_batch = batch_pos.get(current_record_id, -1) + 1
     st.markdown(f"### Record {record_index_in_batch} of {len(user_batch)} in your batch")
     
     # Render annotation form
     annotation_data = annotation_ui.render_annotation_form(
-        current_record, user_id, username
+        current_record, user_id, username,
+        existing_annotation=persistence.get_annotation(current_record_id)
     )
     
     # Handle annotation submission
@@ -282,21 +317,15 @@ def tester_view():
         record_id = current_record.get("id")
         
         # HARD LIMIT ENFORCEMENT: Check before saving annotation
-        if persistence.user_has_reached_limit(user_id, batch_size):
+        if state["reached_limit"]:
             st.error("⚠️ You have reached your annotation limit. Cannot save additional annotations.")
             st.stop()
         
         # Validate that record is in user's batch (security check)
-        if record_id not in user_batch:
+        if record_id not in batch_pos:
             st.error("⚠️ Error: This record is not in your assigned batch. Please contact an administrator.")
             st.stop()
         
-        # Additional validation: Check current count before saving
-        current_count = persistence.get_user_annotation_count(user_id)
-        if current_count >= batch_size:
-            st.error("⚠️ You have reached your annotation limit. Cannot save additional annotations.")
-            st.stop()
-        
         # Save annotation (supports both old and new formats)
         persistence.save_annotation(
             record_id=record_id,
@@ -308,15 +337,15 @@ def tester_view():
         )
         
         # Check if limit reached after saving
-        new_count = persistence.get_user_annotation_count(user_id)
-        if new_count >= batch_size:
+        state = persistence.get_user_state(user_id, batch_size)
+        if state["reached_limit"]:
+            # No rerun follows, so update the batch progress bar in place from
+            # the saved annotations
+            user_done = persistence.load_annotations_index().get(user_id, set())
+            batch_completed = sum(1 for rid in user_batch if rid in user_done)
+            annotation_ui.render_progress_bar(batch_completed, batch_total, slot=progress_slot)
             # User has reached limit - show completion screen
-            st.balloons()
-            st.success("🎉 Congratulations! You've completed your annotation task!")
-            st.markdown("### Task Completed!")
-            st.info(f"You have successfully completed {new_count} annotations. Thank you for your work!")
-            st.markdown("---")
-            st.markdown("**Your annotation task is now complete. You cannot annotate additional records.**")
+            _render_task_complete(state["count"])
             # Clear current record
             st.session_state["current_record_id"] = None
             return
@@ -329,8 +358,8 @@ def tester_view():
         st.success("✅ Annotation saved successfully!")
         st.balloons()
         
-        # Auto-refresh to next record in batch
-        st.rerun()
+        # Auto-refresh to next record in batch (only this fragment reruns)
+        st.rerun(scope="fragment")
     
     # Navigation buttons (only within batch)
     st.divider()
@@ -339,7 +368,7 @@ def tester_view():
     with col2:
         if st.button("⏭️ Skip to Next Record in Batch", use_container_width=True):
             st.session_state["current_record_id"] = None
-            st.rerun()
+            st.rerun(scope="fragment")
 
 
 def admin_view():
@@ -408,7 +437,7 @@ def admin_view():
         return
     
     # Load records for count
-    is_valid, error_msg, records = data_loader.validate_jsonl_file(data_file)
+    is_valid, error_msg, records, _, _ = load_records(data_file)
     
     if not is_valid:
         st.error(f"Error loading data: {error_msg}")
@@ -443,23 +472,15 @@ def admin_view():
     
     # Audit trail
     st.markdown("### Annotation Audit Trail")
+    # Taken before loading, so a save landing in between makes the cached table
+    # and the stored export look stale rather than current
+    annotations_key = persistence._annotations_stat_key()
     annotations = persistence.load_annotations()
     
     if annotations:
         # Display annotations in a table
-        annotation_list = []
-        for record_id, annotation in annotations.items():
-            # Check if conversations or translation was edited
-            was_edited = bool(annotation.get("edited_translation") or annotation.get("edited_conversations"))
-            annotation_list.append({
-                "Record ID": record_id,
-                "Annotator": annotation.get("username", "Unknown"),
-                "Correct": "✓" if annotation.get("is_correct") else "✗",
-                "Edited": "Yes" if was_edited else "No",
-                "Timestamp": annotation.get("timestamp", "Unknown")
-            })
-        
-        st.dataframe(annotation_list, use_container_width=True, hide_index=True)
+        audit_df = _audit_trail_frame(annotations, annotations_key)
+        st.dataframe(audit_df, use_container_width=True, hide_index=True)
     else:
         st.info("No annotations recorded yet.")
     
@@ -476,9 +497,13 @@ def admin_view():
     with col2:
         export_metadata = st.checkbox("Include annotation metadata", value=True)
     
+    # Everything the export depends on; a stored export built from anything else is stale
+    export_key = (export_all, export_metadata, data_file, annotations_key)
+    
     if st.button("📥 Export Corrected JSONL", type="primary"):
-        # Create corrected records
-        corrected_records = []
+        # Collect the records to export, then serialize them in one pass
+        export_records = []
+        exported_count = 0
         annotated_count = 0
         unannotated_count = 0
         
@@ -491,44 +516,63 @@ def admin_view():
                 unannotated_count += 1
                 continue
             
-            corrected_record = record.copy()
-            
-            # Update conversations if edited (new format)
-            if annotation and annotation.get("edited_conversations"):
-                corrected_record["conversations"] = annotation["edited_conversations"]
-            
-            # Update translation if edited (old format)
-            if annotation and annotation.get("edited_translation"):
-                corrected_record["pidgin_translation"] = annotation["edited_translation"]
-            
-            # Add annotation metadata if requested (without timestamp)
-            if annotation and export_metadata:
-                corrected_record["_annotation"] = {
-                    "annotated_by": annotation.get("username"),
-                    "is_correct": annotation.get("is_correct")
-                    # Timestamp removed per requirements - export should be clean
-                }
+            # Only copy the record when something will be changed or added to it
+            edited_conversations = annotation.get("edited_conversations") if annotation else None
+            edited_translation = annotation.get("edited_translation") if annotation else None
+            if edited_conversations or edited_translation or (annotation and export_metadata):
+                corrected_record = record.copy()
+                
+                # Update conversations if edited (new format)
+                if edited_conversations:
+                    corrected_record["conversations"] = edited_conversations
+                
+                # Update translation if edited (old format)
+                if edited_translation:
+                    corrected_record["pidgin_translation"] = edited_translation
+                
+                # Add annotation metadata if requested (without timestamp)
+                if annotation and export_metadata:
+                    corrected_record["_annotation"] = {
+                        "annotated_by": annotation.get("username"),
+                        "is_correct": annotation.get("is_correct")
+                        # Timestamp removed per requirements - export should be clean
+                    }
+            else:
+                corrected_record = record
             
-            corrected_records.append(corrected_record)
+            export_records.append(corrected_record)
+            exported_count += 1
             if annotation:
                 annotated_count += 1
         
-        # Export to file
-        output_file = "corrected_translations.jsonl"
-        data_loader.export_to_jsonl(corrected_records, output_file)
-        
-        st.success(f"✅ Exported {len(corrected_records)} records to {output_file}")
-        if not export_all and unannotated_count > 0:
-            st.info(f"ℹ️ {unannotated_count} unannotated records were excluded. Check 'Include all records' to include them.")
+        # Keep the export in session state so the download button survives the
+        # rerun its own click triggers without rebuilding the export
+        st.session_state["export_payload"] = {
+            "data": data_loader.dumps_jsonl(export_records),
+            "exported_count": exported_count,
+            "unannotated_count": unannotated_count,
+            "export_all": export_all,
+            "key": export_key
+        }
+    
+    export_payload = st.session_state.get("export_payload")
+    if export_payload and export_payload["key"] != export_key:
+        # Options changed or annotations were saved since it was built
+        del st.session_state["export_payload"]
+        export_payload = None
+    
+    if export_payload:
+        st.success(f"✅ Exported {export_payload['exported_count']} records")
+        if not export_payload["export_all"] and export_payload["unannotated_count"] > 0:
+            st.info(f"ℹ️ {export_payload['unannotated_count']} unannotated records were excluded. Check 'Include all records' to include them.")
         
         # Provide download link
-        with open(output_file, 'r', encoding='utf-8') as f:
-            st.download_button(
-                label="⬇️ Download Corrected JSONL",
-                data=f.read(),
-                file_name=output_file,
-                mime="application/jsonl"
-            )
+        st.download_button(
+            label="⬇️ Download Corrected JSONL",
+            data=export_payload["data"],
+            file_name="corrected_translations.jsonl",
+            mime="application/jsonl"
+        )
     
     st.divider()
     
@@ -597,29 +641,43 @@ def admin_view():
         
         # Display testers with delete option
         if testers:
+            # Per-user annotation sets, built once per annotations version and shared
+            annotation_index = persistence.load_annotations_index()
+            
             st.markdown("**Testers:**")
-            for tester_username, tester_data in testers.items():
-                col1, col2, col3 = st.columns([3, 1, 1])
-                with col1:
-                    st.write(f"👤 **{tester_username}** (ID: {tester_data.get('user_id', tester_username)})")
-                
-                with col2:
-                    # Count annotations by this user
-                    annotations = persistence.load_annotations()
-                    user_annotations_count = sum(
-                        1 for ann in annotations.values() 
-                        if ann.get("user_id") == tester_data.get("user_id", tester_username)
-                    )
-                    st.metric("Annotations", user_annotations_count)
-                
-                with col3:
-                    if st.button("🗑️ Delete", key=f"delete_{tester_username}", use_container_width=True):
-                        success, message = auth.delete_user(tester_username, username)
-                        if success:
-                            st.success(message)
-                            st.rerun()
-                        else:
-                            st.error(message)
+            # One table for all testers instead of a row of widgets per tester;
+            # inside a form so ticking Delete boxes doesn't rerun the page
+            tester_df = pd.DataFrame({
+                "User": list(testers),
+                "ID": [d.get("user_id", u) for u, d in testers.items()],
+                "Annotations": [len(annotation_index.get(d.get("user_id", u), ())) for u, d in testers.items()],
+                "Delete": False
+            })
+            with st.form("tester_table"):
+                edited_testers = st.data_editor(
+                    tester_df,
+                    disabled=["User", "ID", "Annotations"],
+                    column_config={
+                        "User": st.column_config.TextColumn("👤 User"),
+                        "Delete": st.column_config.CheckboxColumn("🗑️ Delete")
+                    },
+                    hide_index=True,
+                    use_container_width=True,
+                    key="tester_editor"
+                )
+                delete_submitted = st.form_submit_button("🗑️ Delete Selected")
+            
+            if delete_submitted:
+                deleted = False
+                for tester_username in edited_testers.loc[edited_testers["Delete"], "User"]:
+                    success, message = auth.delete_user(tester_username, username)
+                    if success:
+                        st.success(message)
+                        deleted = True
+                    else:
+                        st.error(message)
+                if deleted:
+                    st.rerun()
             
             st.divider()
         
@@ -685,9 +743,8 @@ def main():
     if not auth.is_authenticated():
         login_page()
     else:
-        # Check if password change is required
-        username = auth.get_current_user()
-        if username and auth.requires_password_change(username):
+        # Check if password change is required (resolved at login, no file read)
+        if auth.is_password_change_required():
             password_change_page()
         else:
             # Route to appropriate view based on role
@@ -8,12 +8,18 @@ This module handles:
 - Password change functionality
 """
 
-import json
+import copy
+import hashlib
+import hmac
 import os
+import threading
 import bcrypt
 import streamlit as st
+from functools import lru_cache
 from typing import Optional, Dict, Tuple
 from dotenv import load_dotenv
+import config
+import persistence
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +29,9 @@ DEFAULT_ADMIN_USER = "admin"
 # Get default password from environment variable, fallback to secure default
 # IMPORTANT: Set ADMIN_PASSWORD in .env file or environment variable
 DEFAULT_ADMIN_PASS = os.getenv("ADMIN_PASSWORD", "CHANGE_ME_ON_FIRST_LOGIN")
+# Serializes users database writes from concurrent sessions in this process.
+# Reentrant so read-modify-write callers can hold it across save_users().
+_USERS_WRITE_LOCK = threading.RLock()
 
 
 def hash_password(password: str) -> str:
@@ -35,7 +44,7 @@ def hash_password(password: str) -> str:
     Returns:
         Bcrypt hashed password string
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=config.get_bcrypt_cost())
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -51,30 +60,76 @@ def verify_password_hash(hashed: str, password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    # Old SHA-256 hashes (migration support) are recognized by their shape,
+    # so bcrypt failures never fall through to a second hash computation
+    if _is_legacy_sha256(hashed):
+        candidate = hashlib.sha256(password.encode('utf-8')).digest()
+        return hmac.compare_digest(candidate, bytes.fromhex(hashed))
+    
     try:
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-    except Exception:
-        # Fallback for old SHA-256 hashes (migration support)
-        import hashlib
-        old_hash = hashlib.sha256(password.encode()).hexdigest()
-        return old_hash == hashed
+    except ValueError:
+        # Malformed stored hash
+        return False
+
+
+def _is_legacy_sha256(hashed: str) -> bool:
+    """Check whether a stored hash is a legacy SHA-256 hex digest."""
+    return len(hashed) == 64 and all(c in "0123456789abcdef" for c in hashed)
+
+
+def _needs_rehash(hashed: str) -> bool:
+    """
+    Check whether a stored hash should be upgraded on the next successful login.
+    
+    True for legacy SHA-256 hex digests and for bcrypt hashes whose embedded
+    cost ("$2b$<cost>$...") is below the currently configured cost.
+    """
+    if _is_legacy_sha256(hashed):
+        return True
+    try:
+        return int(hashed.split("$")[2]) < config.get_bcrypt_cost()
+    except (IndexError, ValueError):
+        return False
 
 
 def load_users() -> Dict[str, Dict]:
-    """Load users from the users database file."""
-    if os.path.exists(USER_DB_FILE):
-        try:
-            with open(USER_DB_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
-    return {}
+    """
+    Load users from the users database file.
+    
+    The parsed file is cached per file version, so the many lookups made in a
+    single rerun only stat the file. A deep copy is returned since callers
+    modify the result before saving it.
+    """
+    return copy.deepcopy(_load_users_cached(persistence._file_stat_key(USER_DB_FILE)))
+
+
+def _users_read_only() -> Dict[str, Dict]:
+    """
+    Get the cached users without copying them, for lookups that never modify
+    the result. Anything that edits and saves users must use load_users().
+    """
+    return _load_users_cached(persistence._file_stat_key(USER_DB_FILE))
+
+
+@lru_cache(maxsize=1)
+def _load_users_cached(version: Tuple[int, int]) -> Dict[str, Dict]:
+    """Read the users database file; cached for a single file version."""
+    return persistence.load_json_file(USER_DB_FILE, {})
 
 
 def save_users(users: Dict[str, Dict]) -> None:
-    """Save users to the users database file."""
-    with open(USER_DB_FILE, 'w', encoding='utf-8') as f:
-        json.dump(users, f, indent=2)
+    """
+    Save users to the users database file atomically.
+    
+    Uses persistence.save_json_file, which replaces the database only once the
+    new contents are on disk, so a crash or concurrent write can't leave a
+    truncated file behind.
+    """
+    with _USERS_WRITE_LOCK:
+        persistence.save_json_file(USER_DB_FILE, users)
+    # Don't rely on the mtime alone; a save can land within the same tick
+    _load_users_cached.cache_clear()
 
 
 def initialize_default_users():
@@ -97,35 +152,39 @@ def initialize_default_users():
         save_users(users)
 
 
-def verify_password(username: str, password: str) -> bool:
+def verify_password(username: str, password: str, users: Optional[Dict[str, Dict]] = None) -> bool:
     """
     Verify if the provided password matches the user's stored hash.
     
     Args:
         username: Username to verify
         password: Plain text password to verify
+        users: Already-loaded users, or None to load them
         
     Returns:
         True if password is correct, False otherwise
     """
-    users = load_users()
+    if users is None:
+        users = _users_read_only()
     if username in users:
         stored_hash = users[username]["password_hash"]
         return verify_password_hash(stored_hash, password)
     return False
 
 
-def get_user_role(username: str) -> Optional[str]:
-    """Get the role of a user (admin or tester)."""
-    users = load_users()
+def get_user_role(username: str, users: Optional[Dict[str, Dict]] = None) -> Optional[str]:
+    """Get the role of a user (admin or tester), from already-loaded users if given."""
+    if users is None:
+        users = _users_read_only()
     if username in users:
         return users[username].get("role", "tester")
     return None
 
 
-def get_user_id(username: str) -> Optional[str]:
-    """Get the user ID for a username."""
-    users = load_users()
+def get_user_id(username: str, users: Optional[Dict[str, Dict]] = None) -> Optional[str]:
+    """Get the user ID for a username, from already-loaded users if given."""
+    if users is None:
+        users = _users_read_only()
     if username in users:
         return users[username].get("user_id", username)
     return None
@@ -138,20 +197,47 @@ def login(username: str, password: str) -> bool:
     Returns:
         True if login successful, False otherwise
     """
-    if verify_password(username, password):
-        st.session_state["authenticated"] = True
-        st.session_state["username"] = username
-        st.session_state["user_id"] = get_user_id(username)
-        st.session_state["role"] = get_user_role(username)
+    # Read the users database once for the password check and session fields
+    users = _users_read_only()
+    if verify_password(username, password, users):
+        user = users[username]
+        # Upgrade legacy or weaker hashes now that we have the password
+        if _needs_rehash(user["password_hash"]):
+            _upgrade_password_hash(username, user["password_hash"], hash_password(password))
+        
+        st.session_state.update({
+            "authenticated": True,
+            "username": username,
+            "user_id": user.get("user_id", username),
+            "role": user.get("role", "tester"),
+            # Resolved once here so reruns after login never read the users file
+            "password_change_required": not user.get("password_changed", True)
+        })
         return True
     return False
 
 
+def _upgrade_password_hash(username: str, old_hash: str, new_hash: str) -> None:
+    """
+    Replace a user's password hash with a stronger one computed at login.
+    
+    The new hash is computed by the caller outside the write lock; here the
+    users are re-read under it and only updated if the user still exists with
+    the hash that was verified, so a concurrent deletion or password change
+    made while hashing is never overwritten.
+    """
+    with _USERS_WRITE_LOCK:
+        users = load_users()
+        if username in users and users[username]["password_hash"] == old_hash:
+            users[username]["password_hash"] = new_hash
+            save_users(users)
+
+
 def logout():
     """Clear authentication from session state."""
-    for key in ["authenticated", "username", "user_id", "role"]:
-        if key in st.session_state:
-            del st.session_state[key]
+    session = st.session_state
+    for key in ["authenticated", "username", "user_id", "role", "password_change_required"]:
+        session.pop(key, None)
 
 
 def is_authenticated() -> bool:
@@ -161,16 +247,14 @@ def is_authenticated() -> bool:
 
 def get_current_user() -> Optional[str]:
     """Get the current authenticated username."""
-    if is_authenticated():
-        return st.session_state.get("username")
-    return None
+    session = st.session_state
+    return session.get("username") if session.get("authenticated") else None
 
 
 def get_current_user_id() -> Optional[str]:
     """Get the current authenticated user ID."""
-    if is_authenticated():
-        return st.session_state.get("user_id")
-    return None
+    session = st.session_state
+    return session.get("user_id") if session.get("authenticated") else None
 
 
 def is_admin() -> bool:
@@ -178,6 +262,11 @@ def is_admin() -> bool:
     return st.session_state.get("role") == "admin"
 
 
+def is_password_change_required() -> bool:
+    """Check if the current user must change their password, as recorded at login."""
+    return st.session_state.get("password_change_required", False)
+
+
 def register_user(username: str, password: str, role: str = "tester") -> Tuple[bool, str]:
     """
     Register a new user.
@@ -185,21 +274,28 @@ def register_user(username: str, password: str, role: str = "tester") -> Tuple[b
     Returns:
         (success: bool, message: str)
     """
-    users = load_users()
-    
-    if username in users:
+    if username in _users_read_only():
         return False, "Username already exists"
     
     if not username or not password:
         return False, "Username and password are required"
     
-    users[username] = {
-        "password_hash": hash_password(password),
-        "role": role,
-        "user_id": username,
-        "password_changed": True  # New users set their own password, so it's "changed"
-    }
-    save_users(users)
+    # Hash outside the lock, then add the user to a fresh read under it so a
+    # concurrent save by another session isn't overwritten
+    password_hash = hash_password(password)
+    with _USERS_WRITE_LOCK:
+        users = load_users()
+        if username in users:
+            return False, "Username already exists"
+        
+        users[username] = {
+            "password_hash": password_hash,
+            "role": role,
+            "user_id": username,
+            "password_changed": True  # New users set their own password, so it's "changed"
+        }
+        save_users(users)
+    
     return True, f"User {username} registered successfully"
 
 
@@ -237,23 +333,31 @@ def change_password(username: str, old_password: str, new_password: str) -> Tupl
     Returns:
         (success: bool, message: str)
     """
-    users = load_users()
+    users = _users_read_only()
     
     if username not in users:
         return False, "User not found"
     
     # Verify old password
-    if not verify_password(username, old_password):
+    if not verify_password(username, old_password, users):
         return False, "Current password is incorrect"
     
     # Validate new password
     if not new_password or len(new_password) < 6:
         return False, "New password must be at least 6 characters long"
     
-    # Update password
-    users[username]["password_hash"] = hash_password(new_password)
-    users[username]["password_changed"] = True
-    save_users(users)
+    # Hash outside the lock, then apply the update to a fresh read under it so
+    # a save by another session since the checks above isn't overwritten
+    new_hash = hash_password(new_password)
+    with _USERS_WRITE_LOCK:
+        users = load_users()
+        if username not in users:
+            return False, "User not found"
+        
+        # Update password
+        users[username]["password_hash"] = new_hash
+        users[username]["password_changed"] = True
+        save_users(users)
     
     return True, "Password changed successfully"
 
@@ -268,7 +372,7 @@ def requires_password_change(username: str) -> bool:
     Returns:
         True if password change is required, False otherwise
     """
-    users = load_users()
+    users = _users_read_only()
     if username in users:
         return not users[username].get("password_changed", True)
     return False
@@ -288,22 +392,25 @@ def delete_user(username: str, current_username: str) -> Tuple[bool, str]:
     Returns:
         (success: bool, message: str)
     """
-    users = load_users()
-    
-    if username not in users:
-        return False, "User not found"
-    
-    # Prevent self-deletion
-    if username == current_username:
-        return False, "You cannot delete your own account"
-    
-    # Prevent deleting admin users (optional safety check)
-    if users[username].get("role") == "admin":
-        return False, "Cannot delete admin users"
-    
-    # Delete the user
-    del users[username]
-    save_users(users)
+    # Check and delete under the write lock so the user can't change (e.g. be
+    # made an admin) between the checks and the save
+    with _USERS_WRITE_LOCK:
+        users = load_users()
+        
+        if username not in users:
+            return False, "User not found"
+        
+        # Prevent self-deletion
+        if username == current_username:
+            return False, "You cannot delete your own account"
+        
+        # Prevent deleting admin users (optional safety check)
+        if users[username].get("role") == "admin":
+            return False, "Cannot delete admin users"
+        
+        # Delete the user
+        del users[username]
+        save_users(users)
     
     return True, f"User {username} deleted successfully. Their annotations have been preserved."
 
@@ -6,38 +6,54 @@ This module handles:
 - Loading and saving configuration
 """
 
-import json
 import os
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
+import persistence
 
 
 CONFIG_FILE = "config.json"
 DEFAULT_BATCH_SIZE = 50
 DEFAULT_DATA_FILE = "complete_corrected_combined.jsonl"
+DEFAULT_BCRYPT_COST = 12
+MIN_BCRYPT_COST = 4  # bcrypt's supported range
+MAX_BCRYPT_COST = 31
 
 
 def load_config() -> Dict:
-    """Load configuration from file, returning defaults if file doesn't exist."""
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                # Ensure batch_size is present and valid
-                if "batch_size" not in config or not isinstance(config["batch_size"], int) or config["batch_size"] < 1:
-                    config["batch_size"] = DEFAULT_BATCH_SIZE
-                # Ensure data_file is present
-                if "data_file" not in config:
-                    config["data_file"] = DEFAULT_DATA_FILE
-                return config
-        except (json.JSONDecodeError, IOError):
-            return {"batch_size": DEFAULT_BATCH_SIZE, "data_file": DEFAULT_DATA_FILE}
-    return {"batch_size": DEFAULT_BATCH_SIZE, "data_file": DEFAULT_DATA_FILE}
+    """
+    Load configuration from file, returning defaults if file doesn't exist.
+    
+    The parsed file is cached per (mtime, size), so repeated accessor calls
+    across reruns only stat the file. A copy is returned so callers can modify it.
+    """
+    return dict(_load_config_cached(persistence._file_stat_key(CONFIG_FILE)))
+
+
+@lru_cache(maxsize=1)
+def _load_config_cached(version: Tuple[int, int]) -> Dict:
+    """Read and validate the config file; cached for a single file version."""
+    # A missing or unreadable file loads as {} and gets every default below
+    config = persistence.load_json_file(CONFIG_FILE, {})
+    # Ensure batch_size is present and valid
+    if "batch_size" not in config or not isinstance(config["batch_size"], int) or config["batch_size"] < 1:
+        config["batch_size"] = DEFAULT_BATCH_SIZE
+    # Ensure data_file is present
+    if "data_file" not in config:
+        config["data_file"] = DEFAULT_DATA_FILE
+    return config
 
 
 def save_config(config: Dict) -> None:
-    """Save configuration to file."""
-    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    """
+    Save configuration to file atomically.
+    
+    Uses persistence.save_json_file, which replaces the config only once the
+    new contents are on disk, so a crash mid-write can't leave a truncated file
+    that silently resets settings to defaults.
+    """
+    persistence.save_json_file(CONFIG_FILE, config)
+    _load_config_cached.cache_clear()
 
 
 def get_batch_size() -> int:
@@ -86,3 +102,18 @@ def set_data_file(data_file: str) -> bool:
     save_config(config)
     return True
 
+
+def get_bcrypt_cost() -> int:
+    """
+    Get the bcrypt cost (log2 rounds) for new password hashes.
+    
+    The BCRYPT_COST environment variable takes precedence over "bcrypt_cost" in
+    the config file, so each deployment can tune login latency for its hardware.
+    Invalid values fall back to the default; valid ones are clamped to bcrypt's range.
+    """
+    cost = os.getenv("BCRYPT_COST") or load_config().get("bcrypt_cost", DEFAULT_BCRYPT_COST)
+    try:
+        cost = int(cost)
+    except (TypeError, ValueError):
+        return DEFAULT_BCRYPT_COST
+    return min(max(cost, MIN_BCRYPT_COST), MAX_BCRYPT_COST)
@@ -10,18 +10,23 @@ This module handles:
 import json
 import os
 import hashlib
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
-def load_jsonl(file_path: str) -> List[Dict]:
+
+def iter_jsonl(file_path: str) -> Iterator[Dict]:
     """
-    Load a JSONL file and return a list of dictionaries.
+    Parse a JSONL file lazily, yielding one dictionary per non-empty line.
     
     Args:
         file_path: Path to the JSONL file
         
-    Returns:
-        List of dictionaries, one per line
+    Yields:
+        One dictionary per line
         
     Raises:
         FileNotFoundError: If file doesn't exist
@@ -30,23 +35,45 @@ def load_jsonl(file_path: str) -> List[Dict]:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    records = []
-    with open(file_path, 'r', encoding='utf-8') as f:
+    # Read raw bytes and let the parser decode UTF-8 itself, skipping the text
+    # layer's per-line decode into a str that would only be parsed again.
+    # Parsed with the stdlib on purpose: orjson turns integers wider than 64 bits
+    # into floats (changing record IDs) and rejects NaN/Infinity.
+    with open(file_path, 'rb') as f:
         for line_num, line in enumerate(f, 1):
             line = line.strip()
             if not line:  # Skip empty lines
                 continue
             try:
-                record = json.loads(line)
-                records.append(record)
+                yield json.loads(line)
             except json.JSONDecodeError as e:
                 raise json.JSONDecodeError(
                     f"Invalid JSON on line {line_num}: {e.msg}",
                     e.doc,
                     e.pos
                 )
+
+
+def load_jsonl(file_path: str) -> List[Dict]:
+    """
+    Load a JSONL file and return a list of dictionaries.
     
-    return records
+    Args:
+        file_path: Path to the JSONL file
+        
+    Returns:
+        List of dictionaries, one per line
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        json.JSONDecodeError: If file contains invalid JSON
+    """
+    return list(iter_jsonl(file_path))
+
+
+# Field and role sets checked for every record, built once
+OLD_FORMAT_FIELDS = frozenset(["id", "source_text", "pidgin_translation"])
+CONVERSATION_ROLES = frozenset(["user", "assistant"])
 
 
 def validate_record(record: Dict) -> Tuple[bool, Optional[str]]:
@@ -76,14 +103,13 @@ def validate_record(record: Dict) -> Tuple[bool, Optional[str]]:
                 return False, f"conversation {idx} must be a dictionary"
             if "role" not in conv or "content" not in conv:
                 return False, f"conversation {idx} must have 'role' and 'content' fields"
-            if conv.get("role") not in ["user", "assistant"]:
+            if conv.get("role") not in CONVERSATION_ROLES:
                 return False, f"conversation {idx} role must be 'user' or 'assistant'"
         
         return True, None
     
     # Check for old format (backward compatibility)
-    required_fields = ["id", "source_text", "pidgin_translation"]
-    if all(field in record for field in required_fields):
+    if OLD_FORMAT_FIELDS.issubset(record):
         return True, None
     
     return False, "Record must have either 'conversations' field or 'id', 'source_text', 'pidgin_translation' fields"
@@ -121,13 +147,15 @@ def normalize_record(record: Dict, index: int) -> Dict:
         index: Index of the record in the file
         
     Returns:
-        Normalized record with 'id' field
+        Normalized record with 'id' field; the record itself if it already has
+        one, otherwise a copy with a generated ID added
     """
-    normalized = record.copy()
+    if "id" in record:
+        return record
     
     # Generate ID if missing
-    if "id" not in normalized:
-        normalized["id"] = generate_record_id(record, index)
+    normalized = record.copy()
+    normalized["id"] = generate_record_id(record, index)
     
     return normalized
 
@@ -143,15 +171,12 @@ def validate_jsonl_file(file_path: str) -> Tuple[bool, Optional[str], List[Dict]
         (is_valid: bool, error_message: Optional[str], records: List[Dict])
     """
     try:
-        records = load_jsonl(file_path)
-        
-        if not records:
-            return False, "File is empty or contains no valid records", []
-        
-        # Validate each record and normalize
+        # Parse, validate and normalize in a single pass, so the raw
+        # records are never all held in memory alongside the normalized ones
         invalid_records = []
         normalized_records = []
-        for idx, record in enumerate(records):
+        idx = -1
+        for idx, record in enumerate(iter_jsonl(file_path)):
             is_valid, error_msg = validate_record(record)
             if not is_valid:
                 invalid_records.append((idx, error_msg))
@@ -160,6 +185,9 @@ def validate_jsonl_file(file_path: str) -> Tuple[bool, Optional[str], List[Dict]
                 normalized = normalize_record(record, idx)
                 normalized_records.append(normalized)
         
+        if idx < 0:
+            return False, "File is empty or contains no valid records", []
+        
         if invalid_records:
             error_details = ", ".join([f"record {idx}: {msg}" for idx, msg in invalid_records])
             return False, f"Validation errors: {error_details}", normalized_records
@@ -174,6 +202,45 @@ def validate_jsonl_file(file_path: str) -> Tuple[bool, Optional[str], List[Dict]
         return False, f"Unexpected error: {str(e)}", []
 
 
+def _dump_record(record: Dict) -> bytes:
+    """
+    Serialize one record to compact JSON bytes exactly as the stdlib would.
+    
+    orjson is used when available, but it rejects integers wider than 64 bits
+    and writes NaN/Infinity as null; records it can't serialize, and lines
+    containing null (which may have been NaN), go through the stdlib instead.
+    """
+    if orjson:
+        try:
+            line = orjson.dumps(record)
+        except TypeError:
+            line = None
+        if line is not None and b"null" not in line:
+            return line
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def dumps_jsonl(records: Iterable[Dict]) -> bytes:
+    """
+    Serialize records to JSONL bytes, one compact JSON object per line.
+    
+    Each record is serialized to bytes on its own (with orjson when available)
+    and the lines are joined once at the end, instead of growing a text buffer
+    and encoding it again afterwards.
+    
+    Args:
+        records: Records to serialize
+        
+    Returns:
+        UTF-8 encoded JSONL, with a trailing newline unless there are no records
+    """
+    lines = [_dump_record(record) for record in records]
+    if not lines:
+        return b""
+    lines.append(b"")
+    return b"\n".join(lines)
+
+
 def export_to_jsonl(records: List[Dict], output_path: str) -> None:
     """
     Export a list of records to a JSONL file.
@@ -182,7 +249,6 @@ def export_to_jsonl(records: List[Dict], output_path: str) -> None:
         records: List of dictionaries to export
         output_path: Path to output file
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for record in records:
-            f.write(json.dumps(record, ensure_ascii=False) + '\n')
-
+    # One write of the serialized file rather than a write per record
+    with open(output_path, 'wb') as f:
+        f.write(dumps_jsonl(records))
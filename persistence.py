@@ -10,35 +10,219 @@ This module handles:
 
 import json
 import os
+import threading
 import time
-from typing import Dict, List, Optional, Set
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _dump_document(data: Dict, pretty: bool = True) -> bytes:
+        """Serialize a whole JSON file, indented for reading by hand if pretty."""
+        if pretty:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    
+    def _dump_line(data: Dict) -> bytes:
+        """Serialize one compact journal line, without the trailing newline."""
+        return orjson.dumps(data)
+except ImportError:  # orjson is optional; the stdlib module reads and writes the same files
+    _json_loads = json.loads
+    
+    def _dump_document(data: Dict, pretty: bool = True) -> bytes:
+        """Serialize a whole JSON file, indented for reading by hand if pretty."""
+        if pretty:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    def _dump_line(data: Dict) -> bytes:
+        """Serialize one compact journal line, without the trailing newline."""
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-ANNOTATIONS_FILE = "annotations.json"
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; only the in-process locks below apply there
+    fcntl = None
+
+
+ANNOTATIONS_FILE = "annotations.json"  # Compacted snapshot of all annotations
+ANNOTATIONS_JOURNAL_FILE = "annotations.jsonl"  # Annotations appended since the last snapshot
 ASSIGNMENTS_FILE = "assignments.json"
 BATCH_ASSIGNMENTS_FILE = "batch_assignments.json"  # Track which records belong to user's current batch
 LOCK_TIMEOUT = 300  # 5 minutes in seconds
+LOCK_RENEW_AFTER = 0.8 * LOCK_TIMEOUT  # Re-stamp a user's own lock once it is this old
+JOURNAL_COMPACT_MIN_ENTRIES = 500  # Never fold the journal into the snapshot more often than this
+
+# Serializes journal appends and compaction from concurrent sessions in this process
+_ANNOTATIONS_WRITE_LOCK = threading.Lock()
+# Serializes read-modify-writes of the assignment and batch assignment files in this process
+_ASSIGNMENTS_WRITE_LOCK = threading.Lock()
+# Single-slot cache of the parsed annotations: (version, annotations, journal entries).
+# Replaced as a whole so readers never see a version paired with other data.
+_annotations_cache: Optional[Tuple[Tuple, Dict, int]] = None
+# Parsed assignment files keyed by path: {path: ((mtime_ns, size), data)}
+_json_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
+
+@contextmanager
+def _locked(file_path: str, shared: bool = False):
+    """
+    Hold a lock on file_path across processes: exclusive for a read-modify-write,
+    or shared for a read that must not interleave with one.
+    
+    The lock is taken on a separate "<file_path>.lock" file, because the data
+    file itself is replaced on every save. Not reentrant: don't nest two
+    _locked() calls on the same path.
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    fd = os.open(file_path + ".lock", os.O_CREAT | os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # Closing the descriptor releases the lock
 
 
 def load_json_file(file_path: str, default: Dict) -> Dict:
     """Load a JSON file, returning default if it doesn't exist."""
     if os.path.exists(file_path):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with open(file_path, 'rb') as f:
+                return _json_loads(f.read())
+        except (ValueError, IOError):
             return default.copy()
     return default.copy()
 
 
-def save_json_file(file_path: str, data: Dict) -> None:
-    """Save data to a JSON file atomically."""
-    # Write to temporary file first, then rename (atomic on most systems)
-    temp_path = file_path + ".tmp"
-    with open(temp_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    os.replace(temp_path, file_path)
+def _read_json_cached(file_path: str) -> Dict:
+    """
+    Get a JSON file's parsed contents, re-parsing only when its (mtime, size) changes.
+    
+    The returned dict is shared with later callers and must not be modified.
+    """
+    version = _file_stat_key(file_path)
+    cached = _json_cache.get(file_path)
+    if cached is None or cached[0] != version:
+        cached = (version, load_json_file(file_path, {}))
+        _json_cache[file_path] = cached
+    return cached[1]
+
+
+def _load_json_cached(file_path: str) -> Dict:
+    """
+    Load a JSON file through the cache for a read-modify-write.
+    
+    Returns a shallow copy: callers may add, replace or delete top-level
+    entries before saving, but must not modify nested values in place.
+    """
+    return dict(_read_json_cached(file_path))
+
+
+def _write_temp_json(file_path: str, data: Dict, pretty: bool = True) -> str:
+    """
+    Write data to a uniquely named, fsynced temporary file next to file_path.
+    
+    Returns the temporary path; the caller renames it into place.
+    """
+    # A unique temp file per write, so concurrent writers never share or
+    # truncate one another's temp file. Created with mode 0o666 so the kernel
+    # applies the process umask, as it would for a newly created file.
+    while True:
+        temp_path = f"{os.path.abspath(file_path)}.{os.urandom(8).hex()}.tmp"
+        try:
+            fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # Keep the permissions of the file being replaced
+            try:
+                os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+            except FileNotFoundError:
+                pass
+            f.write(_dump_document(data, pretty))
+            # Make sure the data is on disk before the rename makes it visible
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return temp_path
+
+
+def _remember_saved(file_path: str, data: Dict) -> None:
+    """Keep a cached file current with what was just written instead of re-reading it."""
+    if file_path in _json_cache:
+        _json_cache[file_path] = (_file_stat_key(file_path), dict(data))
+
+
+def save_json_file(file_path: str, data: Dict, pretty: bool = True) -> None:
+    """Save data to a JSON file atomically and durably, indented if pretty."""
+    save_many({file_path: data}, pretty)
+
+
+def _fsync_dir(dir_path: str) -> None:
+    """Flush a directory entry so renames into it survive a crash."""
+    if os.name == "nt":  # Directories can't be opened for fsync on Windows
+        return
+    dir_fd = os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def save_many(files: Dict[str, Dict], pretty: bool = True) -> None:
+    """
+    Save several JSON files that live in the same directory as one commit.
+    
+    Every temp file is written and fsynced before any of them is renamed into
+    place, then the directory is fsynced once so all the renames are durable
+    together, instead of paying a full write-and-rename cycle per file.
+    
+    Args:
+        files: Mapping of file path to the data to write there
+        pretty: Indent the output for reading by hand; off for large
+            machine-read files, where it mostly adds bytes
+    """
+    temp_paths = {}
+    try:
+        for file_path, data in files.items():
+            temp_paths[file_path] = _write_temp_json(file_path, data, pretty)
+        for file_path, temp_path in list(temp_paths.items()):
+            os.replace(temp_path, file_path)
+            del temp_paths[file_path]
+    except BaseException:
+        for temp_path in temp_paths.values():
+            os.unlink(temp_path)
+        raise
+    
+    _fsync_dir(os.path.dirname(os.path.abspath(next(iter(files)))))
+    
+    for file_path, data in files.items():
+        _remember_saved(file_path, data)
+
+
+def _file_stat_key(file_path: str) -> Tuple[int, int]:
+    """Return (mtime in ns, size) for a file, or (0, 0) if it doesn't exist."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return 0, 0
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _annotations_stat_key() -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Cache key covering both the annotations snapshot and its journal."""
+    return _file_stat_key(ANNOTATIONS_FILE), _file_stat_key(ANNOTATIONS_JOURNAL_FILE)
 
 
 def load_annotations() -> Dict:
@@ -56,8 +240,95 @@ def load_annotations() -> Dict:
             "username": str
         }
     }
+    
+    Annotations are stored as a JSON snapshot plus a JSONL journal of the
+    annotations saved since; the journal is replayed over the snapshot, with
+    the last entry for a record winning.
+    
+    The result is cached per (mtime, size) of both files, so repeated loads
+    within and across reruns only stat them. The returned dict is a shallow
+    copy: add or replace entries freely, but don't modify the annotation dicts
+    in place.
     """
-    return load_json_file(ANNOTATIONS_FILE, {})
+    annotations, _ = _load_annotations_cached(_annotations_stat_key())
+    return dict(annotations)
+
+
+def _load_annotations_cached(version: Tuple, write_locked: bool = False) -> Tuple[Dict, int]:
+    """
+    Get the annotations for a version of the files, re-reading them only when
+    the version differs from the cached one.
+    
+    Args:
+        version: Stat key of the files, from _annotations_stat_key()
+        write_locked: True if the caller already holds the annotations write locks
+    
+    Returns:
+        (annotations, number of journal entries in the journal file)
+    """
+    global _annotations_cache
+    cached = _annotations_cache
+    if cached is None or cached[0] != version:
+        if write_locked:
+            annotations, journal_entries = _read_annotations()
+        else:
+            # Compaction replaces the snapshot and then empties the journal, so
+            # read both under the locks to never see the old snapshot paired
+            # with the already emptied journal
+            with _ANNOTATIONS_WRITE_LOCK, _locked(ANNOTATIONS_FILE, shared=True):
+                annotations, journal_entries = _read_annotations()
+        cached = (version, annotations, journal_entries)
+        _annotations_cache = cached
+    return cached[1], cached[2]
+
+
+def _read_annotations() -> Tuple[Dict, int]:
+    """
+    Read the snapshot and replay the journal onto it.
+    
+    Returns:
+        (annotations, number of journal entries replayed)
+    """
+    annotations = load_json_file(ANNOTATIONS_FILE, {})
+    journal_entries = 0
+    try:
+        with open(ANNOTATIONS_JOURNAL_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    entry = _json_loads(line)
+                except ValueError:
+                    # Torn line left by an interrupted append
+                    continue
+                annotations[entry.pop("record_id")] = entry
+                journal_entries += 1
+    except OSError:
+        pass
+    return annotations, journal_entries
+
+
+def _append_journal_entry(record_id: str, annotation_data: Dict) -> None:
+    """Append one annotation to the journal and flush it to disk."""
+    entry = {"record_id": record_id, **annotation_data}
+    line = _dump_line(entry) + b"\n"
+    with open(ANNOTATIONS_JOURNAL_FILE, 'a+b') as f:
+        # Start on a fresh line if an earlier append was cut short
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _same_annotation(old: Dict, new: Dict) -> bool:
+    """Check whether two annotations are equal, ignoring their timestamps."""
+    if len(old) != len(new):
+        return False
+    return all(
+        key == "timestamp" or (key in old and old[key] == value)
+        for key, value in new.items()
+    )
 
 
 def save_annotation(record_id: str, user_id: str, username: str, 
@@ -66,6 +337,10 @@ def save_annotation(record_id: str, user_id: str, username: str,
     """
     Save an annotation for a record.
     
+    The annotation is appended to the journal, so a save writes one line rather
+    than the whole file. Once the journal outgrows the snapshot it is folded
+    back in, keeping the total rewrite cost linear in the number of saves.
+    
     Args:
         record_id: ID of the record being annotated
         user_id: ID of the user making the annotation
@@ -74,8 +349,6 @@ def save_annotation(record_id: str, user_id: str, username: str,
         edited_translation: The edited translation (for old format, if correction was made)
         edited_conversations: The edited conversations array (for new format, if correction was made)
     """
-    annotations = load_annotations()
-    
     annotation_data = {
         "user_id": user_id,
         "username": username,
@@ -89,17 +362,105 @@ def save_annotation(record_id: str, user_id: str, username: str,
     if edited_translation is not None:
         annotation_data["edited_translation"] = edited_translation
     
-    annotations[record_id] = annotation_data
-    
-    save_json_file(ANNOTATIONS_FILE, annotations)
+    global _annotations_cache
+    with _ANNOTATIONS_WRITE_LOCK, _locked(ANNOTATIONS_FILE):
+        annotations, journal_entries = _load_annotations_cached(_annotations_stat_key(),
+                                                                write_locked=True)
+        
+        # A resubmission identical apart from its timestamp (e.g. a retried
+        # save) changes nothing, so don't write it again
+        existing = annotations.get(record_id)
+        if existing is not None and _same_annotation(existing, annotation_data):
+            return
+        
+        annotations = dict(annotations)
+        annotations[record_id] = annotation_data
+        
+        if journal_entries + 1 >= max(JOURNAL_COMPACT_MIN_ENTRIES, len(annotations)):
+            # Compact: write a new snapshot including this annotation, then
+            # empty the journal (replaying it again would be harmless)
+            # The snapshot is the one large file and is only read by the app
+            # (exports and the audit trail are how people view it), so skip indenting
+            save_json_file(ANNOTATIONS_FILE, annotations, pretty=False)
+            open(ANNOTATIONS_JOURNAL_FILE, 'w').close()
+            journal_entries = 0
+        else:
+            _append_journal_entry(record_id, annotation_data)
+            journal_entries += 1
+        
+        # We know exactly what changed, so update the cache in memory instead
+        # of re-reading the files on the next load
+        _annotations_cache = (_annotations_stat_key(), annotations, journal_entries)
+        _annotations_index_cached.cache_clear()
 
 
 def get_annotation(record_id: str) -> Optional[Dict]:
-    """Get annotation for a specific record."""
-    annotations = load_annotations()
+    """
+    Get annotation for a specific record.
+    
+    Looked up in the cached annotations without copying them, so this costs a
+    stat of the files; the returned annotation is shared and must not be modified.
+    """
+    annotations, _ = _load_annotations_cached(_annotations_stat_key())
     return annotations.get(record_id)
 
 
+def index_annotations_by_user(annotations: Dict) -> Dict[str, Set[str]]:
+    """
+    Build an index of annotated record IDs per user.
+    
+    Answers "is record X annotated by user Y?" with a set lookup instead of
+    scanning all annotations.
+    
+    Returns:
+        {user_id: set of record_ids annotated by that user}
+    """
+    index: Dict[str, Set[str]] = {}
+    for record_id, annotation in annotations.items():
+        user_id = annotation.get("user_id")
+        if user_id:
+            index.setdefault(user_id, set()).add(record_id)
+    return index
+
+
+def load_annotations_index() -> Dict[str, Set[str]]:
+    """
+    Get annotated record IDs per user for the current annotations file.
+    
+    Built once per file version and shared between callers, so don't modify
+    the returned sets in place.
+    
+    Returns:
+        {user_id: set of record_ids annotated by that user}
+    """
+    return _annotations_index_cached(_annotations_stat_key())
+
+
+@lru_cache(maxsize=1)
+def _annotations_index_cached(version: Tuple) -> Dict[str, Set[str]]:
+    """Index the annotations by user; cached for a single version of the files."""
+    annotations, _ = _load_annotations_cached(version)
+    return index_annotations_by_user(annotations)
+
+
+def index_live_locks(assignments: Dict, current_time: float) -> Dict[str, str]:
+    """
+    Build an index of unexpired record locks.
+    
+    Args:
+        assignments: Assignments as returned by load_assignments()
+        current_time: Unix timestamp to check expiry against
+        
+    Returns:
+        {record_id: user_id holding the lock}
+    """
+    return {
+        record_id: assignment.get("user_id")
+        for record_id, assignment in assignments.items()
+        if current_time - assignment.get("timestamp", 0) < LOCK_TIMEOUT
+    }
+
+
 def load_assignments() -> Dict:
     """
     Load record assignments from disk.
@@ -111,8 +472,10 @@ def load_assignments() -> Dict:
             "timestamp": float (Unix timestamp)
         }
     }
+    
+    Cached per file version; see _load_json_cached for what callers may modify.
     """
-    return load_json_file(ASSIGNMENTS_FILE, {})
+    return _load_json_cached(ASSIGNMENTS_FILE)
 
 
 def save_assignments(assignments: Dict) -> None:
@@ -127,41 +490,43 @@ def assign_record(record_id: str, user_id: str) -> bool:
     Returns:
         True if assignment successful, False if already assigned to another user
     """
-    assignments = load_assignments()
-    current_time = time.time()
-    
-    # Check if record is already assigned
-    if record_id in assignments:
-        assignment = assignments[record_id]
-        assignment_time = assignment.get("timestamp", 0)
+    with _ASSIGNMENTS_WRITE_LOCK, _locked(ASSIGNMENTS_FILE):
+        assignments = load_assignments()
+        current_time = time.time()
         
-        # If assignment is still valid and assigned to different user
-        if (current_time - assignment_time < LOCK_TIMEOUT and 
-            assignment.get("user_id") != user_id):
-            return False
+        # Check if record is already assigned
+        if record_id in assignments:
+            assignment = assignments[record_id]
+            # Age is computed once so both checks agree at the timeout boundary
+            age = current_time - assignment.get("timestamp", 0)
+            
+            if age < LOCK_TIMEOUT:
+                # Still held by a different user
+                if assignment.get("user_id") != user_id:
+                    return False
+                # Already ours and fresh: nothing to write
+                if age <= LOCK_RENEW_AFTER:
+                    return True
+            # Otherwise it expired (or is ours and due for renewal); take it over
         
-        # If assignment expired, allow reassignment
-        if current_time - assignment_time >= LOCK_TIMEOUT:
-            # Remove expired assignment
-            del assignments[record_id]
-    
-    # Assign to current user
-    assignments[record_id] = {
-        "user_id": user_id,
-        "timestamp": current_time
-    }
-    
-    save_assignments(assignments)
-    return True
+        # Assign to current user
+        assignments[record_id] = {
+            "user_id": user_id,
+            "timestamp": current_time
+        }
+        
+        save_assignments(assignments)
+        return True
 
 
 def release_assignment(record_id: str, user_id: str) -> None:
     """Release an assignment for a record (usually after annotation is complete)."""
-    assignments = load_assignments()
-    
-    if record_id in assignments and assignments[record_id].get("user_id") == user_id:
-        del assignments[record_id]
-        save_assignments(assignments)
+    with _ASSIGNMENTS_WRITE_LOCK, _locked(ASSIGNMENTS_FILE):
+        assignments = load_assignments()
+        
+        if record_id in assignments and assignments[record_id].get("user_id") == user_id:
+            del assignments[record_id]
+            save_assignments(assignments)
 
 
 def load_batch_assignments() -> Dict:
@@ -175,8 +540,10 @@ def load_batch_assignments() -> Dict:
             "timestamp": float
         }
     }
+    
+    Cached per file version; see _load_json_cached for what callers may modify.
     """
-    return load_json_file(BATCH_ASSIGNMENTS_FILE, {})
+    return _load_json_cached(BATCH_ASSIGNMENTS_FILE)
 
 
 def save_batch_assignments(batch_assignments: Dict) -> None:
@@ -200,68 +567,73 @@ def assign_batch_to_user(user_id: str, batch_size: int, all_record_ids: List[str
         List of record IDs assigned to the user (may be less than batch_size if not enough available).
         Returns empty list if user has already reached their limit.
     """
-    # HARD LIMIT: Check if user has already completed their allocation
-    if user_has_reached_limit(user_id, batch_size):
-        return []  # User has reached limit, no new batch
-    
-    assignments = load_assignments()
-    annotations = load_annotations()
-    batch_assignments = load_batch_assignments()
-    current_time = time.time()
-    
-    # Check if user already has a batch assigned
-    if user_id in batch_assignments:
-        existing_batch = batch_assignments[user_id].get("batch_record_ids", [])
-        # If user has an incomplete batch, don't assign a new one
-        if existing_batch:
-            # Check if batch is complete
-            batch_complete = all(
-                record_id in annotations and annotations[record_id].get("user_id") == user_id
-                for record_id in existing_batch
-            )
-            if not batch_complete:
-                return []  # User already has an incomplete batch
-    
-    # Get records not yet annotated by anyone (to prevent repeated batches)
-    available_records = []
-    for record_id in all_record_ids:
-        # Skip if already annotated by anyone (prevents repeated batches)
-        if record_id in annotations:
-            continue
+    with _ASSIGNMENTS_WRITE_LOCK, _locked(ASSIGNMENTS_FILE):
+        # Read each file once: the annotations and their per-user index from
+        # the same version (read-only), the assignment files as copies to modify
+        version = _annotations_stat_key()
+        annotations, _ = _load_annotations_cached(version)
+        user_done = _annotations_index_cached(version).get(user_id, set())
         
-        # Check if assigned to another user (and not expired)
-        if record_id in assignments:
-            assignment = assignments[record_id]
-            assignment_time = assignment.get("timestamp", 0)
-            assigned_user = assignment.get("user_id")
-            
-            # Skip if assigned to another user and not expired
-            if (assigned_user != user_id and 
-                current_time - assignment_time < LOCK_TIMEOUT):
+        # HARD LIMIT: Check if user has already completed their allocation
+        if len(user_done) >= batch_size:
+            return []  # User has reached limit, no new batch
+        
+        assignments = load_assignments()
+        batch_assignments = load_batch_assignments()
+        current_time = time.time()
+        
+        # Check if user already has a batch assigned
+        if user_id in batch_assignments:
+            existing_batch = batch_assignments[user_id].get("batch_record_ids", [])
+            # If user has an incomplete batch, don't assign a new one
+            if existing_batch:
+                # Check if batch is complete
+                if not user_done.issuperset(existing_batch):
+                    return []  # User already has an incomplete batch
+        
+        # Get records not yet annotated by anyone (to prevent repeated batches)
+        available_records = []
+        for record_id in all_record_ids:
+            # Skip if already annotated by anyone (prevents repeated batches)
+            if record_id in annotations:
                 continue
+            
+            # Check if assigned to another user (and not expired)
+            if record_id in assignments:
+                assignment = assignments[record_id]
+                assignment_time = assignment.get("timestamp", 0)
+                assigned_user = assignment.get("user_id")
+                
+                # Skip if assigned to another user and not expired
+                if (assigned_user != user_id and 
+                    current_time - assignment_time < LOCK_TIMEOUT):
+                    continue
+            
+            available_records.append(record_id)
         
-        available_records.append(record_id)
-    
-    # Take up to batch_size records
-    batch_record_ids = available_records[:batch_size]
-    
-    # Assign each record to the user
-    for record_id in batch_record_ids:
-        assignments[record_id] = {
-            "user_id": user_id,
+        # Take up to batch_size records
+        batch_record_ids = available_records[:batch_size]
+        
+        # Assign each record to the user
+        for record_id in batch_record_ids:
+            assignments[record_id] = {
+                "user_id": user_id,
+                "timestamp": current_time
+            }
+        
+        # Save batch assignment tracking
+        batch_assignments[user_id] = {
+            "batch_record_ids": batch_record_ids,
             "timestamp": current_time
         }
-    
-    # Save batch assignment tracking
-    batch_assignments[user_id] = {
-        "batch_record_ids": batch_record_ids,
-        "timestamp": current_time
-    }
-    
-    save_assignments(assignments)
-    save_batch_assignments(batch_assignments)
-    
-    return batch_record_ids
+        
+        # Both files in one durable commit rather than two separate saves
+        save_many({
+            ASSIGNMENTS_FILE: assignments,
+            BATCH_ASSIGNMENTS_FILE: batch_assignments
+        })
+        
+        return batch_record_ids
 
 
 def get_user_batch(user_id: str) -> List[str]:
@@ -271,9 +643,10 @@ def get_user_batch(user_id: str) -> List[str]:
     Returns:
         List of record IDs in current batch, empty list if no batch assigned
     """
-    batch_assignments = load_batch_assignments()
-    if user_id in batch_assignments:
-        return batch_assignments[user_id].get("batch_record_ids", [])
+    # Read-only lookup, so use the cached data directly rather than a copy
+    batch = _read_json_cached(BATCH_ASSIGNMENTS_FILE).get(user_id)
+    if batch:
+        return list(batch.get("batch_record_ids", []))
     return []
 
 
@@ -288,14 +661,8 @@ def user_has_completed_batch(user_id: str) -> bool:
     if not batch_record_ids:
         return True  # No batch = considered "complete" (needs new batch)
     
-    annotations = load_annotations()
-    
-    # Check if all records in batch are annotated by this user
-    for record_id in batch_record_ids:
-        if record_id not in annotations or annotations[record_id].get("user_id") != user_id:
-            return False
-    
-    return True
+    # Complete when every batch record is in the user's annotated set
+    return load_annotations_index().get(user_id, set()).issuperset(batch_record_ids)
 
 
 def can_user_annotate(user_id: str, batch_size: int) -> bool:
@@ -312,41 +679,44 @@ def can_user_annotate(user_id: str, batch_size: int) -> bool:
     Returns:
         True if user can still annotate, False if they've reached their limit
     """
-    # Check if user has reached their hard limit
-    if user_has_reached_limit(user_id, batch_size):
-        return False
-    
-    # Check if user has a batch and if it's complete
-    batch_record_ids = get_user_batch(user_id)
-    if not batch_record_ids:
-        # No batch assigned yet - can annotate if under limit
-        return True
-    
-    # Has a batch - check if it's complete
-    return not user_has_completed_batch(user_id)
+    # Under the hard limit, and either no batch assigned yet or the batch is
+    # still incomplete; get_user_state reads the index and batch only once
+    return get_user_state(user_id, batch_size)["can_annotate"]
 
 
 def clear_user_batch(user_id: str) -> None:
     """Clear the user's current batch assignment."""
-    batch_assignments = load_batch_assignments()
-    if user_id in batch_assignments:
-        del batch_assignments[user_id]
-        save_batch_assignments(batch_assignments)
+    with _ASSIGNMENTS_WRITE_LOCK, _locked(ASSIGNMENTS_FILE):
+        batch_assignments = load_batch_assignments()
+        if user_id in batch_assignments:
+            del batch_assignments[user_id]
+            save_batch_assignments(batch_assignments)
 
 
 def get_assigned_records(user_id: str) -> Set[str]:
     """Get set of record IDs assigned to a specific user."""
-    assignments = load_assignments()
+    user_locks = _assignments_by_user_cached(_file_stat_key(ASSIGNMENTS_FILE)).get(user_id, {})
     current_time = time.time()
     
-    assigned = set()
-    for record_id, assignment in assignments.items():
-        assignment_time = assignment.get("timestamp", 0)
-        if (assignment.get("user_id") == user_id and 
-            current_time - assignment_time < LOCK_TIMEOUT):
-            assigned.add(record_id)
+    # Only this user's locks need an expiry check
+    return {
+        record_id for record_id, assignment_time in user_locks.items()
+        if current_time - assignment_time < LOCK_TIMEOUT
+    }
+
+
+@lru_cache(maxsize=1)
+def _assignments_by_user_cached(version: Tuple[int, int]) -> Dict[str, Dict[str, float]]:
+    """
+    Index the assignments by user; cached for a single version of the file.
     
-    return assigned
+    Returns:
+        {user_id: {record_id: lock timestamp}}
+    """
+    index: Dict[str, Dict[str, float]] = {}
+    for record_id, assignment in _read_json_cached(ASSIGNMENTS_FILE).items():
+        index.setdefault(assignment.get("user_id"), {})[record_id] = assignment.get("timestamp", 0)
+    return index
 
 
 def get_user_annotation_count(user_id: str) -> int:
@@ -359,8 +729,9 @@ def get_user_annotation_count(user_id: str) -> int:
     Returns:
         Total number of annotations completed by this user
     """
-    annotations = load_annotations()
-    return sum(1 for ann in annotations.values() if ann.get("user_id") == user_id)
+    # Size of the user's set in the shared per-version index, rather than a
+    # scan over every annotation on each call
+    return len(load_annotations_index().get(user_id, ()))
 
 
 def user_has_reached_limit(user_id: str, batch_size: int) -> bool:
@@ -378,6 +749,45 @@ def user_has_reached_limit(user_id: str, batch_size: int) -> bool:
     return annotation_count >= batch_size
 
 
+def get_user_state(user_id: str, batch_size: int) -> Dict:
+    """
+    Get a user's annotation count, limit and batch status in one pass.
+    
+    Combines get_user_annotation_count, user_has_reached_limit, get_user_batch,
+    user_has_completed_batch and can_user_annotate so callers that need several
+    of them read the annotations file once instead of once per check.
+    
+    Args:
+        user_id: User ID to check
+        batch_size: The batch size limit
+        
+    Returns:
+        {
+            "count": int,  # Annotations completed by this user
+            "reached_limit": bool,
+            "batch": List[str],  # Record IDs in current batch
+            "batch_complete": bool,  # True if batch is complete or no batch exists
+            "can_annotate": bool
+        }
+    """
+    # Set of records this user annotated, from the shared per-version index
+    user_done = load_annotations_index().get(user_id, set())
+    
+    count = len(user_done)
+    reached_limit = count >= batch_size
+    
+    batch = get_user_batch(user_id)
+    batch_complete = user_done.issuperset(batch)
+    
+    return {
+        "count": count,
+        "reached_limit": reached_limit,
+        "batch": batch,
+        "batch_complete": batch_complete,
+        "can_annotate": not reached_limit and (not batch or not batch_complete)
+    }
+
+
 def get_user_progress(user_id: str, total_records: int) -> Dict:
     """
     Get progress statistics for a user.
@@ -389,8 +799,7 @@ def get_user_progress(user_id: str, total_records: int) -> Dict:
             "percentage": float
         }
     """
-    annotations = load_annotations()
-    completed = sum(1 for ann in annotations.values() if ann.get("user_id") == user_id)
+    completed = get_user_annotation_count(user_id)
     
     percentage = (completed / total_records * 100) if total_records > 0 else 0
     
@@ -416,21 +825,21 @@ def get_all_progress(total_records: int) -> Dict[str, Dict]:
     """
     annotations = load_annotations()
     user_counts = {}
+    # user_id to username mapping, from each user's first annotation that has one
+    user_to_username = {}
     
+    # Count annotations and collect usernames in a single pass
     for annotation in annotations.values():
         user_id = annotation.get("user_id")
-        if user_id:
-            user_counts[user_id] = user_counts.get(user_id, 0) + 1
+        if not user_id:
+            continue
+        user_counts[user_id] = user_counts.get(user_id, 0) + 1
+        if user_id not in user_to_username:
+            username = annotation.get("username")
+            if username:
+                user_to_username[user_id] = username
     
     progress = {}
-    # Build user_id to username mapping
-    user_to_username = {}
-    for annotation in annotations.values():
-        user_id = annotation.get("user_id")
-        username = annotation.get("username")
-        if user_id and username and user_id not in user_to_username:
-            user_to_username[user_id] = username
-    
     for user_id, completed in user_counts.items():
         percentage = (completed / total_records * 100) if total_records > 0 else 0
         progress[user_id] = {
@@ -454,27 +863,14 @@ def get_unassigned_record_ids(all_record_ids: List[str], user_id: str) -> List[s
     Returns:
         List of unassigned record IDs
     """
-    assignments = load_assignments()
-    annotations = load_annotations()
-    current_time = time.time()
-    
-    unassigned = []
-    for record_id in all_record_ids:
-        # Skip if already annotated by this user
-        if record_id in annotations and annotations[record_id].get("user_id") == user_id:
-            continue
-        
-        # Check assignment
-        if record_id not in assignments:
-            unassigned.append(record_id)
-        else:
-            assignment = assignments[record_id]
-            assignment_time = assignment.get("timestamp", 0)
-            
-            # Include if expired or assigned to this user
-            if (current_time - assignment_time >= LOCK_TIMEOUT or
-                assignment.get("user_id") == user_id):
-                unassigned.append(record_id)
+    annotated_by_me = load_annotations_index().get(user_id, set())
+    locked_by_others = {
+        record_id for record_id, holder in index_live_locks(load_assignments(), time.time()).items()
+        if holder != user_id
+    }
     
-    return unassigned
-
+    # Two set lookups per record against exclusions built in one pass each
+    return [
+        record_id for record_id in all_record_ids
+        if record_id not in annotated_by_me and record_id not in locked_by_others
+    ]